@@ -21,12 +21,20 @@ export async function GET(
 
   const statsValues = Object.values(allStats)
   const totalItems = statsValues.length
-  const totalOnHand = statsValues.reduce((s, v) => s + v.current_on_hand, 0)
 
-  const lowStock = statsValues.filter((s) => s.weeks_on_hand != null && s.weeks_on_hand < 1)
-  const trendingUp = statsValues.filter((s) => s.trend_direction === "up")
-  const trendingDown = statsValues.filter((s) => s.trend_direction === "down")
-  const dataIssues = statsValues.filter((s) => s.has_negative_usage || s.has_gaps)
+  // Tally totals and alert counts in a single pass over the stats
+  let totalOnHand = 0
+  let trendingUpCount = 0
+  let trendingDownCount = 0
+  let dataIssuesCount = 0
+  const lowStock: string[] = []
+  for (const s of statsValues) {
+    totalOnHand += s.current_on_hand
+    if (s.weeks_on_hand != null && s.weeks_on_hand < 1) lowStock.push(s.item_name)
+    if (s.trend_direction === "up") trendingUpCount++
+    else if (s.trend_direction === "down") trendingDownCount++
+    if (s.has_negative_usage || s.has_gaps) dataIssuesCount++
+  }
 
   return jsonResponse({
     dataset_id: datasetId,
@@ -41,10 +49,10 @@ export async function GET(
     categories: categorySummary,
     alerts: {
       low_stock_count: lowStock.length,
-      low_stock_items: lowStock.slice(0, 5).map((s) => s.item_name),
-      trending_up_count: trendingUp.length,
-      trending_down_count: trendingDown.length,
-      data_issues_count: dataIssues.length,
+      low_stock_items: lowStock.slice(0, 5),
+      trending_up_count: trendingUpCount,
+      trending_down_count: trendingDownCount,
+      data_issues_count: dataIssuesCount,
     },
   })
 }
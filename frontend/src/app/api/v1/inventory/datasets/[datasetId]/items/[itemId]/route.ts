@@ -12,13 +12,11 @@ export async function GET(
 
   if (!ctx?.orgId) return errorResponse("NOT_FOUND", "Item not found", 404)
 
+  // Only this item's rows are needed, so skip loading the whole dataset
   const repo = new SupabaseRepository(ctx.orgId)
-  const dataset = await repo.getDataset(datasetId)
-  if (!dataset) return errorResponse("NOT_FOUND", "Dataset not found", 404)
+  const found = await repo.getItem(datasetId, itemId)
+  if (!found) return errorResponse("NOT_FOUND", "Item not found", 404)
 
-  const item = dataset.items[itemId]
-  if (!item) return errorResponse("NOT_FOUND", "Item not found", 404)
-
-  const detail = getItemDetail(item, dataset.records)
+  const detail = getItemDetail(found.item, found.records)
   return jsonResponse(detail)
 }
@@ -1,7 +1,7 @@
 import { NextRequest } from "next/server"
 import { authenticateOptional, errorResponse, jsonResponse } from "@/lib/api-utils"
 import { SupabaseRepository } from "@/lib/supabase/repository"
-import { computeItemStats } from "@/lib/services/stats-service"
+import { computeItemStats, groupRecordsByItem } from "@/lib/services/stats-service"
 
 export async function GET(
   request: NextRequest,
@@ -21,21 +21,18 @@ export async function GET(
   const category = searchParams.get("category")
   const vendor = searchParams.get("vendor")
 
-  let itemList = Object.values(dataset.items)
-
-  if (search) {
-    itemList = itemList.filter((i) => i.name.toLowerCase().includes(search))
-  }
-  if (category) {
-    itemList = itemList.filter((i) => i.category === category)
-  }
-  if (vendor) {
-    itemList = itemList.filter((i) => i.vendor === vendor)
-  }
+  // Apply all filters in one pass over the items
+  const itemList = Object.values(dataset.items).filter(
+    (i) =>
+      (!category || i.category === category) &&
+      (!vendor || i.vendor === vendor) &&
+      (!search || i.name.toLowerCase().includes(search)),
+  )
 
+  // Group records once instead of scanning every record for each item
+  const byItem = groupRecordsByItem(dataset.records)
   const items = itemList.map((item) => {
-    const itemRecords = dataset.records.filter((r) => r.item_id === item.item_id)
-    const stats = computeItemStats(item, itemRecords)
+    const stats = computeItemStats(item, byItem.get(item.item_id) ?? [])
     return { ...item, stats }
   })
 
@@ -1,19 +1,9 @@
 import { NextRequest } from "next/server"
 import { authenticateOptional, errorResponse, jsonResponse } from "@/lib/api-utils"
 import { SupabaseRepository } from "@/lib/supabase/repository"
+import { generateId, makeItemId } from "@/lib/ids"
 import type { ParsedDataset, ParsedItem, ParsedRecord } from "@/lib/services/parser-service"
 
-function generateId(prefix: string): string {
-  const hex = Array.from(crypto.getRandomValues(new Uint8Array(6)))
-    .map((b) => b.toString(16).padStart(2, "0"))
-    .join("")
-  return `${prefix}_${hex}`
-}
-
-function makeItemId(name: string): string {
-  return name.toLowerCase().replace(/[^a-z0-9]+/g, "_").replace(/^_|_$/g, "").slice(0, 50)
-}
-
 export async function POST(request: NextRequest) {
   try {
     const ctx = await authenticateOptional(request)
@@ -27,8 +17,8 @@ export async function POST(request: NextRequest) {
       return errorResponse("VALIDATION_ERROR", "At least one item is required")
     }
 
-    const today = new Date().toISOString().split("T")[0]
     const now = new Date().toISOString()
+    const today = now.split("T")[0]
     const warnings: string[] = []
 
     const parsedItems: Record<string, ParsedItem> = {}
@@ -14,11 +14,9 @@ export async function POST(request: NextRequest) {
   let items: Record<string, import("@/lib/services/parser-service").ParsedItem> = {}
 
   if (dataset_id && ctx?.orgId) {
+    // Matching only needs the item catalogue, not the weekly records
     const repo = new SupabaseRepository(ctx.orgId)
-    const dataset = await repo.getDataset(dataset_id)
-    if (dataset) {
-      items = dataset.items
-    }
+    items = await repo.getItems(dataset_id)
   }
 
   const result = matchText(text, items, confidence_threshold ?? 0.7, max_alternatives ?? 3)
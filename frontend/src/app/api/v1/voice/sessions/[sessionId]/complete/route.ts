@@ -17,17 +17,18 @@ export async function POST(
   const session = await repo.getVoiceSession(sessionId)
   if (!session) return errorResponse("NOT_FOUND", "Session not found", 404)
 
+  const now = new Date().toISOString()
   await repo.saveVoiceSession({
     ...session,
     status: "completed",
-    updated_at: new Date().toISOString(),
+    updated_at: now,
   })
 
   return jsonResponse({
     session_id: session.session_id,
     name: session.session_name,
     created_at: session.created_at,
-    updated_at: new Date().toISOString(),
+    updated_at: now,
     status: "completed",
     dataset_id: session.dataset_id,
     location: session.location,
@@ -1,13 +1,7 @@
 import { NextRequest } from "next/server"
 import { authenticate, errorResponse, jsonResponse } from "@/lib/api-utils"
 import { SupabaseRepository } from "@/lib/supabase/repository"
-
-function generateId(prefix: string): string {
-  const hex = Array.from(crypto.getRandomValues(new Uint8Array(6)))
-    .map((b) => b.toString(16).padStart(2, "0"))
-    .join("")
-  return `${prefix}_${hex}`
-}
+import { generateId } from "@/lib/ids"
 
 export async function POST(request: NextRequest) {
   const result = await authenticate(request)
@@ -60,19 +54,14 @@ export async function GET(request: NextRequest) {
 
   if (!ctx.orgId) return jsonResponse([])
 
-  const repo = new SupabaseRepository(ctx.orgId)
-  const sessions = await repo.getVoiceSessions()
-
   const { searchParams } = new URL(request.url)
-  const status = searchParams.get("status")
+  const status = searchParams.get("status") ?? undefined
 
-  let filtered = sessions
-  if (status) {
-    filtered = sessions.filter((s) => s.status === status)
-  }
+  const repo = new SupabaseRepository(ctx.orgId)
+  const sessions = await repo.getVoiceSessions(status)
 
   return jsonResponse(
-    filtered.map((s) => ({
+    sessions.map((s) => ({
       session_id: s.session_id,
       name: s.session_name,
       created_at: s.created_at,
@@ -1,13 +1,7 @@
 import { NextRequest } from "next/server"
 import OpenAI from "openai"
 import { authenticate, errorResponse, jsonResponse } from "@/lib/api-utils"
-
-function generateId(prefix: string): string {
-  const hex = Array.from(crypto.getRandomValues(new Uint8Array(6)))
-    .map((b) => b.toString(16).padStart(2, "0"))
-    .join("")
-  return `${prefix}_${hex}`
-}
+import { generateId } from "@/lib/ids"
 
 export async function POST(request: NextRequest) {
   const result = await authenticate(request)
@@ -0,0 +1,33 @@
+/**
+ * ID helpers for API routes and services.
+ *
+ * Server-side only: kept out of lib/utils (imported by client components) and
+ * apart from the parser so routes that only need an id don't load SheetJS.
+ */
+
+export function makeItemId(name: string): string {
+  return name
+    .toLowerCase()
+    .replace(/[^a-z0-9]+/g, "_")
+    .replace(/^_|_$/g, "")
+    .slice(0, 50)
+}
+
+// IDs draw from a pool of random bytes refilled in bulk, since parsing a
+// sheet generates one per record
+const ID_BYTES = 6
+const idPool = new Uint8Array(ID_BYTES * 512)
+let idPoolOffset = idPool.length
+const HEX = Array.from({ length: 256 }, (_, b) => b.toString(16).padStart(2, "0"))
+
+export function generateId(prefix: string): string {
+  if (idPoolOffset === idPool.length) {
+    crypto.getRandomValues(idPool)
+    idPoolOffset = 0
+  }
+  let hex = ""
+  for (let i = 0; i < ID_BYTES; i++) {
+    hex += HEX[idPool[idPoolOffset++]]
+  }
+  return `${prefix}_${hex}`
+}
@@ -7,6 +7,7 @@
 
 import type { ItemStats } from "./stats-service"
 import type { ParsedItem } from "./parser-service"
+import { generateId } from "../ids"
 
 // ============== Types ==============
 
@@ -117,8 +118,8 @@ export const DEFAULT_CONSTRAINTS: OrderConstraints = {
 
 // ============== Logic ==============
 
+// Excluded items are filtered out by the caller before a target is looked up
 function getTarget(targets: OrderTargets, itemId: string, category?: string): number {
-  if (targets.exclude_items.includes(itemId)) return 0
   if (targets.by_item[itemId] != null) return targets.by_item[itemId]
   if (category && targets.by_category[category] != null) return targets.by_category[category]
   return targets.default_weeks
@@ -136,13 +137,6 @@ function getForecastMultiplier(forecast: SalesForecast | undefined, category?: s
   return 1.0
 }
 
-function generateId(prefix: string): string {
-  const hex = Array.from(crypto.getRandomValues(new Uint8Array(6)))
-    .map((b) => b.toString(16).padStart(2, "0"))
-    .join("")
-  return `${prefix}_${hex}`
-}
-
 function determineReason(
   stats: ItemStats,
   targetWeeks: number,
@@ -199,25 +193,30 @@ export function generateRecommendations(
   const warnings: string[] = []
   const dataIssues: { item_id: string; item_name: string; issues: string[] }[] = []
 
+  // Resolve request filters once rather than per item
+  const categoryFilter = request?.categories ? new Set(request.categories) : null
+  const vendorFilter = request?.vendors ? new Set(request.vendors) : null
+  const excluded = new Set([...targets.exclude_items, ...(request?.exclude_items ?? [])])
+
   for (const [itemId, stats] of Object.entries(allStats)) {
     const item = items[itemId]
     if (!item) continue
 
     // Apply filters
-    if (request?.categories && item.category && !request.categories.includes(item.category)) continue
-    if (request?.vendors && item.vendor && !request.vendors.includes(item.vendor)) continue
-    if (request?.exclude_items?.includes(itemId)) continue
-    if (targets.exclude_items.includes(itemId)) continue
+    if (categoryFilter && item.category && !categoryFilter.has(item.category)) continue
+    if (vendorFilter && item.vendor && !vendorFilter.has(item.vendor)) continue
+    if (excluded.has(itemId)) continue
 
     const targetWeeks = getTarget(targets, itemId, item.category)
     if (targetWeeks <= 0) continue
     if (stats.avg_usage <= 0) continue
 
+    // Items already at target are skipped before any reason text is built
     const woh = stats.weeks_on_hand ?? 0
-    const { reason, reasonText, confidence } = determineReason(stats, targetWeeks, constraints)
+    if (woh >= targetWeeks) continue
 
+    const { reason, reasonText, confidence } = determineReason(stats, targetWeeks, constraints)
     if (reason === "overstock") continue
-    if (woh >= targetWeeks) continue
 
     const weeksNeeded = targetWeeks - woh
     let suggestedQty = Math.max(1, Math.round(weeksNeeded * stats.avg_usage))
@@ -248,6 +247,7 @@ export function generateRecommendations(
 
     const unitCost = item.unit_cost
     const totalCost = unitCost ? unitCost * suggestedQty : undefined
+    const issues = stats.has_negative_usage || stats.has_gaps ? describeIssues(stats) : []
 
     recommendations.push({
       item_id: itemId,
@@ -267,11 +267,11 @@ export function generateRecommendations(
       trend_pct: stats.trend_percent_change,
       forecast_multiplier: forecastMultiplier,
       base_suggested_qty: forecastMultiplier ? baseSuggestedQty : undefined,
-      warnings: stats.has_negative_usage || stats.has_gaps ? describeIssues(stats) : [],
+      warnings: issues,
     })
 
-    if (stats.has_negative_usage || stats.has_gaps) {
-      dataIssues.push({ item_id: itemId, item_name: item.name, issues: describeIssues(stats) })
+    if (issues.length > 0) {
+      dataIssues.push({ item_id: itemId, item_name: item.name, issues })
     }
   }
 
@@ -292,30 +292,34 @@ export function generateRecommendations(
     })
   }
 
-  // Sort by priority
-  filtered.sort((a, b) => {
-    const ap = a.reason === "stockout_risk" ? 0 : 1
-    const bp = b.reason === "stockout_risk" ? 0 : 1
-    if (ap !== bp) return ap - bp
-    return (a.weeks_on_hand ?? 999) - (b.weeks_on_hand ?? 999)
-  })
+  // Sort by priority: stockout risk first, then fewest weeks on hand.
+  // Keys are computed once per recommendation rather than per comparison.
+  filtered = filtered
+    .map((rec) => ({ rec, priority: rec.reason === "stockout_risk" ? 0 : 1, woh: rec.weeks_on_hand ?? 999 }))
+    .sort((a, b) => a.priority - b.priority || a.woh - b.woh)
+    .map(({ rec }) => rec)
 
-  // Build summary
-  const totalSpend = filtered.reduce((s, r) => s + (r.total_cost ?? 0), 0)
+  // Build summary in a single pass
+  let totalSpend = 0
+  let lowStockCount = 0
   const byVendor: Record<string, { items: number; spend: number }> = {}
   const byCategory: Record<string, { items: number; spend: number }> = {}
   const byReason: Record<string, number> = {}
 
   for (const rec of filtered) {
+    const cost = rec.total_cost ?? 0
+    totalSpend += cost
+    if (rec.reason === "stockout_risk" || rec.reason === "low_stock") lowStockCount++
+
     const v = rec.vendor || "Unknown"
     byVendor[v] = byVendor[v] ?? { items: 0, spend: 0 }
     byVendor[v].items++
-    byVendor[v].spend += rec.total_cost ?? 0
+    byVendor[v].spend += cost
 
     const c = rec.category || "Uncategorized"
     byCategory[c] = byCategory[c] ?? { items: 0, spend: 0 }
     byCategory[c].items++
-    byCategory[c].spend += rec.total_cost ?? 0
+    byCategory[c].spend += cost
 
     byReason[rec.reason] = (byReason[rec.reason] ?? 0) + 1
   }
@@ -330,7 +334,7 @@ export function generateRecommendations(
     recommendations: filtered,
     total_items: filtered.length,
     total_spend: totalSpend,
-    low_stock_count: filtered.filter((r) => r.reason === "stockout_risk" || r.reason === "low_stock").length,
+    low_stock_count: lowStockCount,
     overstock_count: 0,
     by_vendor: byVendor,
     by_category: byCategory,
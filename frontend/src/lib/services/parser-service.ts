@@ -6,6 +6,7 @@
  */
 
 import * as XLSX from "xlsx"
+import { generateId, makeItemId } from "../ids"
 
 // ============== Types ==============
 
@@ -53,56 +54,41 @@ export interface ParseResult {
 
 // ============== Column detection patterns ==============
 
-const ITEM_PATTERNS = [/^item/i, /^product/i, /^name/i, /^description/i, /^sku/i, /^material/i, /^inventory.?item/i]
-const COUNT_PATTERNS = [/^on.?hand/i, /^qty/i, /^quantity/i, /^count/i, /^stock/i, /^ending/i, /^end.?inv/i, /^current/i, /^balance/i]
-const USAGE_PATTERNS = [/^usage/i, /^used/i, /^consumed/i, /^sold/i, /^movement/i]
-const CATEGORY_PATTERNS = [/^category/i, /^type/i, /^group/i, /^class/i, /^dept/i]
-const DATE_PATTERNS = [/^date/i, /^week/i, /^period/i, /^time/i]
-const VENDOR_PATTERNS = [/^vendor/i, /^supplier/i, /^source/i]
-
-function findMatch(columns: string[], patterns: RegExp[]): string | null {
-  for (const col of columns) {
-    for (const pattern of patterns) {
-      if (pattern.test(col)) return col
-    }
-  }
-  return null
-}
+// One alternation per column kind, so each header is scanned once per kind
+const ITEM_PATTERN = /^(?:item|product|name|description|sku|material|inventory.?item)/i
+const COUNT_PATTERN = /^(?:on.?hand|qty|quantity|count|stock|ending|end.?inv|current|balance)/i
+const USAGE_PATTERN = /^(?:usage|used|consumed|sold|movement)/i
+const CATEGORY_PATTERN = /^(?:category|type|group|class|dept)/i
+const DATE_PATTERN = /^(?:date|week|period|time)/i
+const VENDOR_PATTERN = /^(?:vendor|supplier|source)/i
 
-function makeItemId(name: string): string {
-  return name
-    .toLowerCase()
-    .replace(/[^a-z0-9]+/g, "_")
-    .replace(/^_|_$/g, "")
-    .slice(0, 50)
-}
+// Summary rows ("TOTAL", "Grand Total", ...) are skipped
+const TOTAL_ROW = /total/i
+
+// Preferred sheet in a multi-sheet workbook
+const SHEET_PATTERN = /inventory|data|sheet1/i
 
-function generateId(prefix: string): string {
-  const hex = Array.from(crypto.getRandomValues(new Uint8Array(6)))
-    .map((b) => b.toString(16).padStart(2, "0"))
-    .join("")
-  return `${prefix}_${hex}`
+function findMatch(columns: string[], pattern: RegExp): string | null {
+  return columns.find((col) => pattern.test(col)) ?? null
 }
 
 // ============== Main parser ==============
 
-export function parseBuffer(
-  buffer: ArrayBuffer,
-  filename: string,
-  datasetName?: string,
-  skipRows = 0,
-): ParseResult {
-  const warnings: string[] = []
-
-  // Read workbook
-  const workbook = XLSX.read(buffer, { type: "array", cellDates: true })
+// Rows are read as raw values, so skip generating the formatted text/HTML
+// for every cell. Dense mode stores cells as row arrays rather than one
+// object key per cell address, which is smaller and faster to walk.
+const READ_OPTIONS: XLSX.ParsingOptions = {
+  type: "array",
+  cellDates: true,
+  cellText: false,
+  cellHTML: false,
+  dense: true,
+}
 
-  // Select sheet
-  let sheetName = workbook.SheetNames[0]
-  if (workbook.SheetNames.length > 1) {
-    const found = workbook.SheetNames.find((name) =>
-      ["inventory", "data", "sheet1"].some((kw) => name.toLowerCase().includes(kw)),
-    )
+function selectSheet(sheetNames: string[], warnings: string[]): string {
+  let sheetName = sheetNames[0]
+  if (sheetNames.length > 1) {
+    const found = sheetNames.find((name) => SHEET_PATTERN.test(name))
     if (found) {
       sheetName = found
       warnings.push(`Auto-selected sheet: ${found}`)
@@ -110,8 +96,21 @@ export function parseBuffer(
       warnings.push(`Using first sheet: ${sheetName}`)
     }
   }
+  return sheetName
+}
+
+export function parseBuffer(
+  buffer: ArrayBuffer,
+  filename: string,
+  datasetName?: string,
+  skipRows = 0,
+): ParseResult {
+  const warnings: string[] = []
+
+  // Read workbook once and take the selected sheet from it
+  const workbook = XLSX.read(buffer, READ_OPTIONS)
+  const sheet = workbook.Sheets[selectSheet(workbook.SheetNames, warnings)]
 
-  const sheet = workbook.Sheets[sheetName]
   const rows: Record<string, unknown>[] = XLSX.utils.sheet_to_json(sheet, {
     range: skipRows,
     defval: null,
@@ -125,12 +124,12 @@ export function parseBuffer(
   const columns = Object.keys(rows[0])
 
   // Auto-detect columns
-  const itemCol = findMatch(columns, ITEM_PATTERNS)
-  const onHandCol = findMatch(columns, COUNT_PATTERNS)
-  const usageCol = findMatch(columns, USAGE_PATTERNS)
-  const categoryCol = findMatch(columns, CATEGORY_PATTERNS)
-  const dateCol = findMatch(columns, DATE_PATTERNS)
-  const vendorCol = findMatch(columns, VENDOR_PATTERNS)
+  const itemCol = findMatch(columns, ITEM_PATTERN)
+  const onHandCol = findMatch(columns, COUNT_PATTERN)
+  const usageCol = findMatch(columns, USAGE_PATTERN)
+  const categoryCol = findMatch(columns, CATEGORY_PATTERN)
+  const dateCol = findMatch(columns, DATE_PATTERN)
+  const vendorCol = findMatch(columns, VENDOR_PATTERN)
 
   if (!itemCol) {
     throw new Error("Could not detect item/product name column")
@@ -139,65 +138,66 @@ export function parseBuffer(
   // Parse data
   const items: Record<string, ParsedItem> = {}
   const records: ParsedRecord[] = []
-  const today = new Date().toISOString().split("T")[0]
+  const now = new Date().toISOString()
+  const today = now.split("T")[0]
+  // Item names repeat once per period, so normalise each distinct name once
+  const itemIds = new Map<string, string>()
+  const recordDates = new Set<string>()
+  const categories = new Set<string>()
+  const vendors = new Set<string>()
+  const isoDates = new Map<number | string, string>()
 
   for (const row of rows) {
     const rawName = row[itemCol]
-    if (!rawName || String(rawName).trim() === "" || String(rawName).toUpperCase().includes("TOTAL")) {
-      continue
-    }
+    if (!rawName) continue
 
     const itemName = String(rawName).trim()
-    const itemId = makeItemId(itemName)
+    if (itemName === "" || TOTAL_ROW.test(itemName)) continue
+
+    let itemId = itemIds.get(itemName)
+    if (itemId === undefined) {
+      itemId = makeItemId(itemName)
+      itemIds.set(itemName, itemId)
+    }
 
     // Create item if new
     if (!items[itemId]) {
+      const category = categoryCol ? safeString(row[categoryCol]) : undefined
+      const vendor = vendorCol ? safeString(row[vendorCol]) : undefined
+      if (category) categories.add(category)
+      if (vendor) vendors.add(vendor)
       items[itemId] = {
         item_id: itemId,
         name: itemName,
-        category: categoryCol ? safeString(row[categoryCol]) : undefined,
-        vendor: vendorCol ? safeString(row[vendorCol]) : undefined,
+        category,
+        vendor,
         unit_of_measure: "unit",
       }
     }
 
-    // Parse date
+    // Parse date. Rows in the same period share a date value, so each
+    // distinct value is converted once.
     let recordDate = today
     if (dateCol && row[dateCol]) {
-      try {
-        const d = row[dateCol]
-        if (d instanceof Date) {
-          recordDate = d.toISOString().split("T")[0]
-        } else {
-          const parsed = new Date(String(d))
-          if (!isNaN(parsed.getTime())) {
-            recordDate = parsed.toISOString().split("T")[0]
-          }
-        }
-      } catch {
-        // keep default
+      const d = row[dateCol]
+      const key = d instanceof Date ? d.getTime() : String(d)
+      let isoDate = isoDates.get(key)
+      if (isoDate === undefined) {
+        isoDate = toIsoDate(d) ?? today
+        isoDates.set(key, isoDate)
       }
+      recordDate = isoDate
     }
 
-    // Parse on_hand
-    let onHand = 0
-    if (onHandCol && row[onHandCol] != null) {
-      const parsed = parseFloat(String(row[onHandCol]))
-      if (!isNaN(parsed)) onHand = parsed
-    }
+    // Parse on_hand and usage
+    const onHand = (onHandCol ? toNumber(row[onHandCol]) : undefined) ?? 0
 
-    // Parse usage
-    let usage: number | undefined
-    if (usageCol && row[usageCol] != null) {
-      const parsed = parseFloat(String(row[usageCol]))
-      if (!isNaN(parsed)) {
-        usage = parsed
-        if (parsed < 0) {
-          warnings.push(`Negative usage for ${itemName}: ${parsed}`)
-        }
-      }
+    const usage = usageCol ? toNumber(row[usageCol]) : undefined
+    if (usage !== undefined && usage < 0) {
+      warnings.push(`Negative usage for ${itemName}: ${usage}`)
     }
 
+    recordDates.add(recordDate)
     records.push({
       record_id: generateId("r"),
       item_id: itemId,
@@ -209,34 +209,20 @@ export function parseBuffer(
   }
 
   // Build dataset
-  const dates = [...new Set(records.map((r) => r.record_date))].sort()
-  const categories = [
-    ...new Set(
-      Object.values(items)
-        .map((i) => i.category)
-        .filter(Boolean),
-    ),
-  ].sort() as string[]
-  const vendors = [
-    ...new Set(
-      Object.values(items)
-        .map((i) => i.vendor)
-        .filter(Boolean),
-    ),
-  ].sort() as string[]
+  const dates = [...recordDates].sort()
 
   const dataset: ParsedDataset = {
     dataset_id: generateId("ds"),
     name: datasetName || filename.replace(/\.[^.]+$/, ""),
-    created_at: new Date().toISOString(),
+    created_at: now,
     source_files: [filename],
     date_range_start: dates[0] ?? undefined,
     date_range_end: dates[dates.length - 1] ?? undefined,
     items_count: Object.keys(items).length,
     records_count: records.length,
     periods_count: dates.length,
-    categories,
-    vendors,
+    categories: [...categories].sort(),
+    vendors: [...vendors].sort(),
     items,
     records,
   }
@@ -244,6 +230,19 @@ export function parseBuffer(
   return { dataset, warnings }
 }
 
+function toIsoDate(value: unknown): string | undefined {
+  const d = value instanceof Date ? value : new Date(String(value))
+  if (isNaN(d.getTime())) return undefined
+  return d.toISOString().split("T")[0]
+}
+
+// Numeric cells already arrive as numbers; only text cells need parsing
+function toNumber(value: unknown): number | undefined {
+  if (value == null) return undefined
+  const n = typeof value === "number" ? value : parseFloat(String(value))
+  return isNaN(n) ? undefined : n
+}
+
 function safeString(value: unknown): string | undefined {
   if (value == null) return undefined
   const s = String(value).trim()
@@ -47,13 +47,18 @@ function mean(values: number[]): number {
   return values.reduce((a, b) => a + b, 0) / values.length
 }
 
-function stdev(values: number[]): number {
+function stdev(values: number[], avg = mean(values)): number {
   if (values.length < 2) return 0
-  const avg = mean(values)
   const variance = values.reduce((sum, v) => sum + (v - avg) ** 2, 0) / (values.length - 1)
   return Math.sqrt(variance)
 }
 
+// record_date is an ISO yyyy-mm-dd string, so plain string comparison is
+// chronological and avoids locale-aware collation
+function byRecordDate(a: ParsedRecord, b: ParsedRecord): number {
+  return a.record_date < b.record_date ? -1 : a.record_date > b.record_date ? 1 : 0
+}
+
 function round(value: number, decimals: number): number {
   const factor = 10 ** decimals
   return Math.round(value * factor) / factor
@@ -64,8 +69,15 @@ export function computeItemStats(
   records: ParsedRecord[],
   recentPeriods = 4,
 ): ItemStats {
-  const sorted = [...records].sort((a, b) => a.record_date.localeCompare(b.record_date))
+  return computeSortedItemStats(item, [...records].sort(byRecordDate), recentPeriods)
+}
 
+// Internal callers that already own a date-sorted array skip the copy above
+function computeSortedItemStats(
+  item: ParsedItem,
+  sorted: ParsedRecord[],
+  recentPeriods: number,
+): ItemStats {
   if (sorted.length === 0) {
     return {
       item_id: item.item_id,
@@ -93,10 +105,18 @@ export function computeItemStats(
   const currentOnHand = sorted[sorted.length - 1].on_hand
   const lastCountDate = sorted[sorted.length - 1].record_date
 
-  const totalUsage = usages.reduce((a, b) => a + b, 0)
-  const avgUsage = mean(usages)
-  const minUsage = usages.length > 0 ? Math.min(...usages) : 0
-  const maxUsage = usages.length > 0 ? Math.max(...usages) : 0
+  // Totals and extremes in one pass over the usage history
+  let totalUsage = 0
+  let minUsage = usages.length > 0 ? usages[0] : 0
+  let maxUsage = minUsage
+  let hasNegative = false
+  for (const u of usages) {
+    totalUsage += u
+    if (u < minUsage) minUsage = u
+    if (u > maxUsage) maxUsage = u
+    if (u < 0) hasNegative = true
+  }
+  const avgUsage = usages.length > 0 ? totalUsage / usages.length : 0
 
   const recentUsages = usages.length >= recentPeriods ? usages.slice(-recentPeriods) : usages
   const avgUsageRecent = mean(recentUsages)
@@ -109,10 +129,9 @@ export function computeItemStats(
   }
 
   const [trendDirection, trendChange] = computeTrend(usages, recentPeriods)
-  const stdDev = stdev(usages)
+  const stdDev = stdev(usages, avgUsage)
   const cv = avgUsage > 0 ? stdDev / avgUsage : 0
 
-  const hasNegative = usages.some((u) => u < 0)
   const hasGaps = checkGaps(sorted)
 
   return {
@@ -143,23 +162,38 @@ export function computeAllStats(
   records: ParsedRecord[],
   recentPeriods = 4,
 ): Record<string, ItemStats> {
+  const byItem = groupRecordsByItem(records)
   const stats: Record<string, ItemStats> = {}
   for (const [itemId, item] of Object.entries(items)) {
-    const itemRecords = records.filter((r) => r.item_id === itemId)
-    stats[itemId] = computeItemStats(item, itemRecords, recentPeriods)
+    // Each group is a fresh array, so it can be sorted in place
+    const sorted = (byItem.get(itemId) ?? []).sort(byRecordDate)
+    stats[itemId] = computeSortedItemStats(item, sorted, recentPeriods)
   }
   return stats
 }
 
+export function groupRecordsByItem(records: ParsedRecord[]): Map<string, ParsedRecord[]> {
+  const grouped = new Map<string, ParsedRecord[]>()
+  for (const record of records) {
+    const group = grouped.get(record.item_id)
+    if (group) {
+      group.push(record)
+    } else {
+      grouped.set(record.item_id, [record])
+    }
+  }
+  return grouped
+}
+
 export function getItemDetail(
   item: ParsedItem,
   records: ParsedRecord[],
   recentPeriods = 4,
 ): ItemDetail {
-  const itemRecords = records.filter((r) => r.item_id === item.item_id)
-  const stats = computeItemStats(item, itemRecords, recentPeriods)
+  // Sort the filtered copy once and share it with the stats computation
+  const sorted = records.filter((r) => r.item_id === item.item_id).sort(byRecordDate)
+  const stats = computeSortedItemStats(item, sorted, recentPeriods)
 
-  const sorted = [...itemRecords].sort((a, b) => a.record_date.localeCompare(b.record_date))
   const history: UsageTrend[] = sorted.map((r) => ({
     date: r.record_date,
     usage: r.usage ?? 0,
@@ -176,18 +210,20 @@ export function getItemDetail(
 export function getCategorySummary(
   allStats: Record<string, ItemStats>,
 ): Record<string, { category: string; items_count: number; total_on_hand: number; total_usage: number; avg_weeks_on_hand: number | null }> {
-  const summary: Record<string, { category: string; items_count: number; total_on_hand: number; total_usage: number; woh_list: number[] }> = {}
+  // Weeks on hand is averaged from a running sum and count per category
+  const summary: Record<string, { category: string; items_count: number; total_on_hand: number; total_usage: number; woh_sum: number; woh_count: number }> = {}
 
   for (const stats of Object.values(allStats)) {
     const cat = stats.category || "Uncategorized"
     if (!summary[cat]) {
-      summary[cat] = { category: cat, items_count: 0, total_on_hand: 0, total_usage: 0, woh_list: [] }
+      summary[cat] = { category: cat, items_count: 0, total_on_hand: 0, total_usage: 0, woh_sum: 0, woh_count: 0 }
     }
     summary[cat].items_count++
     summary[cat].total_on_hand += stats.current_on_hand
     summary[cat].total_usage += stats.total_usage
     if (stats.weeks_on_hand != null) {
-      summary[cat].woh_list.push(stats.weeks_on_hand)
+      summary[cat].woh_sum += stats.weeks_on_hand
+      summary[cat].woh_count++
     }
   }
 
@@ -198,7 +234,7 @@ export function getCategorySummary(
       items_count: data.items_count,
       total_on_hand: data.total_on_hand,
       total_usage: data.total_usage,
-      avg_weeks_on_hand: data.woh_list.length > 0 ? round(mean(data.woh_list), 1) : null,
+      avg_weeks_on_hand: data.woh_count > 0 ? round(data.woh_sum / data.woh_count, 1) : null,
     }
   }
   return result
@@ -224,11 +260,13 @@ function computeTrend(usages: number[], recentPeriods: number): ["up" | "down" |
 
 function checkGaps(sorted: ParsedRecord[]): boolean {
   if (sorted.length < 2) return false
+  // Parse each date to a timestamp once; consecutive pairs share a record
+  let prev = Date.parse(sorted[0].record_date)
   for (let i = 1; i < sorted.length; i++) {
-    const prev = new Date(sorted[i - 1].record_date)
-    const curr = new Date(sorted[i].record_date)
-    const gap = (curr.getTime() - prev.getTime()) / (1000 * 60 * 60 * 24)
+    const curr = Date.parse(sorted[i].record_date)
+    const gap = (curr - prev) / (1000 * 60 * 60 * 24)
     if (gap > 14) return true
+    prev = curr
   }
   return false
 }
@@ -236,9 +274,11 @@ function checkGaps(sorted: ParsedRecord[]): boolean {
 function rollingAverage(values: number[], window: number): number[] {
   if (values.length < window) return values
 
+  // Sum each window in place rather than slicing out a new array per point
   return values.map((_, i) => {
     const start = Math.max(0, i - window + 1)
-    const slice = values.slice(start, i + 1)
-    return round(mean(slice), 2)
+    let sum = 0
+    for (let j = start; j <= i; j++) sum += values[j]
+    return round(sum / (i - start + 1), 2)
   })
 }
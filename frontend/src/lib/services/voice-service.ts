@@ -46,6 +46,9 @@ export function matchText(
   const segments = splitSegments(text)
   const parsedItems: ParsedVoiceInput[] = []
   const unmatched: string[] = []
+  // Index the item names once and reuse it for every segment
+  const itemList = Object.values(items)
+  const fuse = itemList.length > 0 ? buildIndex(itemList) : null
 
   for (const segment of segments) {
     const trimmed = segment.trim()
@@ -53,8 +56,8 @@ export function matchText(
 
     const parsed = parseSegment(trimmed)
 
-    if (parsed.item_text && Object.keys(items).length > 0) {
-      const matches = findMatches(parsed.item_text, items, maxAlternatives + 1)
+    if (parsed.item_text && fuse) {
+      const matches = findMatches(parsed.item_text, fuse, maxAlternatives + 1)
 
       if (matches.length > 0 && matches[0].confidence >= confidenceThreshold) {
         parsed.best_match = matches[0]
@@ -82,11 +85,19 @@ export function matchText(
   }
 }
 
+// Segments are separated by commas, newlines, or the word "and"
+const SEGMENT_SEPARATOR = /,|\n|\band\b/i
+
+// Patterns: "2 bottles of buffalo trace", "buffalo trace 2 bottles", "buffalo trace, 2"
+const SEGMENT_PATTERNS = [
+  /^(\d+(?:\.\d+)?)\s*(bottles?|cases?|units?|each)?\s*(?:of\s+)?(.+)$/i,
+  /^(.+?)\s+(\d+(?:\.\d+)?)\s*(bottles?|cases?|units?|each)?$/i,
+  /^(.+?),?\s+(\d+(?:\.\d+)?)$/i,
+]
+
 function splitSegments(text: string): string[] {
-  let t = text.replace(/\n/g, ",")
-  t = t.replace(/\band\b/gi, ",")
-  return t
-    .split(",")
+  return text
+    .split(SEGMENT_SEPARATOR)
     .map((s) => s.trim())
     .filter(Boolean)
 }
@@ -94,14 +105,7 @@ function splitSegments(text: string): string[] {
 function parseSegment(segment: string): ParsedVoiceInput {
   const lower = segment.toLowerCase().trim()
 
-  // Patterns: "2 bottles of buffalo trace", "buffalo trace 2 bottles", "buffalo trace, 2"
-  const patterns = [
-    /^(\d+(?:\.\d+)?)\s*(bottles?|cases?|units?|each)?\s*(?:of\s+)?(.+)$/i,
-    /^(.+?)\s+(\d+(?:\.\d+)?)\s*(bottles?|cases?|units?|each)?$/i,
-    /^(.+?),?\s+(\d+(?:\.\d+)?)$/i,
-  ]
-
-  for (const pattern of patterns) {
+  for (const pattern of SEGMENT_PATTERNS) {
     const match = lower.match(pattern)
     if (!match) continue
     const groups = match.slice(1)
@@ -147,20 +151,20 @@ function parseSegment(segment: string): ParsedVoiceInput {
   }
 }
 
-function findMatches(
-  searchText: string,
-  items: Record<string, ParsedItem>,
-  maxResults: number,
-): MatchCandidate[] {
-  const itemList = Object.values(items)
-
-  const fuse = new Fuse(itemList, {
+function buildIndex(itemList: ParsedItem[]): Fuse<ParsedItem> {
+  return new Fuse(itemList, {
     keys: ["name"],
     threshold: 0.6,
     includeScore: true,
     minMatchCharLength: 2,
   })
+}
 
+function findMatches(
+  searchText: string,
+  fuse: Fuse<ParsedItem>,
+  maxResults: number,
+): MatchCandidate[] {
   const results = fuse.search(searchText, { limit: maxResults })
 
   return results.map((r) => ({
@@ -9,6 +9,42 @@ import type { SupabaseClient } from "@supabase/supabase-js"
 import { getSupabaseAdminClient } from "./server"
 import type { ParsedDataset, ParsedItem, ParsedRecord } from "../services/parser-service"
 
+// Max concurrent insert requests per table when saving a dataset
+const INSERT_CONCURRENCY = 4
+
+// Columns read back when loading datasets; selecting only these keeps
+// per-row payloads small on large weekly_records tables.
+const DATASET_COLUMNS =
+  "dataset_id, name, created_at, source_files, date_range_start, date_range_end, items_count, weeks_count"
+const ITEM_COLUMNS = "item_id, display_name, category, vendor, location, unit_cost, unit_of_measure"
+const RECORD_COLUMNS = "id, item_id, week_date, on_hand, usage, week_name, source_file"
+const VOICE_SESSION_COLUMNS = "session_id, session_name, created_at, updated_at, status, dataset_id, location, notes"
+
+// PostgREST caps rows per response, so weekly records are read in pages
+const RECORD_PAGE_SIZE = 1000
+
+interface ItemRow {
+  item_id: string
+  display_name: string
+  category?: string
+  vendor?: string
+  location?: string
+  unit_cost?: number
+  unit_of_measure: string
+}
+
+function toParsedItem(ir: ItemRow): ParsedItem {
+  return {
+    item_id: ir.item_id,
+    name: ir.display_name,
+    category: ir.category,
+    vendor: ir.vendor,
+    location: ir.location,
+    unit_cost: ir.unit_cost,
+    unit_of_measure: ir.unit_of_measure,
+  }
+}
+
 export class SupabaseRepository {
   private client: SupabaseClient
   private orgId: string
@@ -67,10 +103,7 @@ export class SupabaseRepository {
         metadata: "{}",
       }))
 
-      // Batch insert in chunks of 500
-      for (let i = 0; i < itemsData.length; i += 500) {
-        await this.client.from("items").insert(itemsData.slice(i, i + 500)).throwOnError()
-      }
+      await this.insertInChunks("items", itemsData, 500)
     }
 
     // Save records
@@ -92,60 +125,52 @@ export class SupabaseRepository {
         source_file: r.source_file ?? null,
       }))
 
-      for (let i = 0; i < recordsData.length; i += 1000) {
-        await this.client.from("weekly_records").insert(recordsData.slice(i, i + 1000)).throwOnError()
-      }
+      await this.insertInChunks("weekly_records", recordsData, 1000)
+    }
+  }
+
+  /**
+   * Batch insert rows, keeping a few chunk requests in flight at once
+   * instead of waiting on each round-trip in turn.
+   */
+  private async insertInChunks(table: string, rows: Record<string, unknown>[], chunkSize: number): Promise<void> {
+    const chunks: Record<string, unknown>[][] = []
+    for (let i = 0; i < rows.length; i += chunkSize) {
+      chunks.push(rows.slice(i, i + chunkSize))
+    }
+
+    for (let i = 0; i < chunks.length; i += INSERT_CONCURRENCY) {
+      await Promise.all(
+        chunks.slice(i, i + INSERT_CONCURRENCY).map((chunk) => this.client.from(table).insert(chunk).throwOnError()),
+      )
     }
   }
 
   async getDataset(datasetId: string): Promise<ParsedDataset | null> {
-    const { data: row } = await this.client
-      .from("datasets")
-      .select("*")
-      .eq("dataset_id", datasetId)
-      .eq("org_id", this.orgId)
-      .maybeSingle()
+    // The three reads are independent, so issue them together rather than
+    // paying one round trip after another
+    const [{ data: row }, { data: itemRows }, records] = await Promise.all([
+      this.client
+        .from("datasets")
+        .select(DATASET_COLUMNS)
+        .eq("dataset_id", datasetId)
+        .eq("org_id", this.orgId)
+        .maybeSingle(),
+      this.client.from("items").select(ITEM_COLUMNS).eq("dataset_id", datasetId).eq("org_id", this.orgId),
+      this.getRecords(datasetId),
+    ])
 
     if (!row) return null
 
-    // Get items
-    const { data: itemRows } = await this.client
-      .from("items")
-      .select("*")
-      .eq("dataset_id", datasetId)
-      .eq("org_id", this.orgId)
-
     const items: Record<string, ParsedItem> = {}
+    const categories = new Set<string>()
+    const vendors = new Set<string>()
     for (const ir of itemRows ?? []) {
-      items[ir.item_id] = {
-        item_id: ir.item_id,
-        name: ir.display_name,
-        category: ir.category,
-        vendor: ir.vendor,
-        location: ir.location,
-        unit_cost: ir.unit_cost,
-        unit_of_measure: ir.unit_of_measure,
-      }
+      if (ir.category) categories.add(ir.category)
+      if (ir.vendor) vendors.add(ir.vendor)
+      items[ir.item_id] = toParsedItem(ir)
     }
 
-    // Get records
-    const { data: recRows } = await this.client
-      .from("weekly_records")
-      .select("*")
-      .eq("dataset_id", datasetId)
-      .eq("org_id", this.orgId)
-      .order("week_date")
-
-    const records: ParsedRecord[] = (recRows ?? []).map((r) => ({
-      record_id: String(r.id),
-      item_id: r.item_id,
-      record_date: r.week_date,
-      on_hand: r.on_hand,
-      usage: r.usage,
-      period_name: r.week_name,
-      source_file: r.source_file,
-    }))
-
     const sourceFiles = typeof row.source_files === "string" ? JSON.parse(row.source_files) : row.source_files ?? []
 
     return {
@@ -158,13 +183,92 @@ export class SupabaseRepository {
       items_count: row.items_count,
       records_count: records.length,
       periods_count: row.weeks_count ?? 0,
-      categories: [...new Set(Object.values(items).map((i) => i.category).filter(Boolean))] as string[],
-      vendors: [...new Set(Object.values(items).map((i) => i.vendor).filter(Boolean))] as string[],
+      categories: [...categories],
+      vendors: [...vendors],
       items,
       records,
     }
   }
 
+  /**
+   * Load a single item and its weekly records without reading the rest of
+   * the dataset.
+   */
+  async getItem(datasetId: string, itemId: string): Promise<{ item: ParsedItem; records: ParsedRecord[] } | null> {
+    const [{ data: ir }, records] = await Promise.all([
+      this.client
+        .from("items")
+        .select(ITEM_COLUMNS)
+        .eq("dataset_id", datasetId)
+        .eq("item_id", itemId)
+        .eq("org_id", this.orgId)
+        .maybeSingle(),
+      this.getRecords(datasetId, itemId),
+    ])
+
+    if (!ir) return null
+
+    return { item: toParsedItem(ir), records }
+  }
+
+  /**
+   * Load a dataset's items only, for callers that never touch its weekly
+   * records.
+   */
+  async getItems(datasetId: string): Promise<Record<string, ParsedItem>> {
+    const { data: itemRows } = await this.client
+      .from("items")
+      .select(ITEM_COLUMNS)
+      .eq("dataset_id", datasetId)
+      .eq("org_id", this.orgId)
+
+    const items: Record<string, ParsedItem> = {}
+    for (const ir of itemRows ?? []) {
+      items[ir.item_id] = toParsedItem(ir)
+    }
+    return items
+  }
+
+  /**
+   * Read a dataset's weekly records page by page, converting each page as
+   * it arrives. A single select is truncated at the server's row limit.
+   * The server may cap pages below RECORD_PAGE_SIZE, so the offset advances
+   * by the rows actually returned and only an empty page ends the read.
+   */
+  private async getRecords(datasetId: string, itemId?: string): Promise<ParsedRecord[]> {
+    const records: ParsedRecord[] = []
+    for (let from = 0; ; ) {
+      let query = this.client
+        .from("weekly_records")
+        .select(RECORD_COLUMNS)
+        .eq("dataset_id", datasetId)
+        .eq("org_id", this.orgId)
+
+      if (itemId) query = query.eq("item_id", itemId)
+
+      const { data: recRows } = await query
+        .order("week_date")
+        .order("id")
+        .range(from, from + RECORD_PAGE_SIZE - 1)
+        .throwOnError()
+
+      if (!recRows || recRows.length === 0) return records
+
+      for (const r of recRows) {
+        records.push({
+          record_id: String(r.id),
+          item_id: r.item_id,
+          record_date: r.week_date,
+          on_hand: r.on_hand,
+          usage: r.usage,
+          period_name: r.week_name,
+          source_file: r.source_file,
+        })
+      }
+      from += recRows.length
+    }
+  }
+
   async listDatasets(): Promise<
     {
       dataset_id: string
@@ -181,7 +285,7 @@ export class SupabaseRepository {
   > {
     const { data: rows } = await this.client
       .from("datasets")
-      .select("*")
+      .select(DATASET_COLUMNS)
       .eq("org_id", this.orgId)
       .order("created_at", { ascending: false })
 
@@ -214,8 +318,11 @@ export class SupabaseRepository {
     await this.client.from("items").delete().eq("dataset_id", datasetId).eq("org_id", this.orgId)
 
     const { data: runs } = await this.client.from("agent_runs").select("run_id").eq("dataset_id", datasetId).eq("org_id", this.orgId)
-    for (const run of runs ?? []) {
-      await this.client.from("agent_recommendations").delete().eq("run_id", run.run_id)
+    if (runs && runs.length > 0) {
+      await this.client
+        .from("agent_recommendations")
+        .delete()
+        .in("run_id", runs.map((run) => run.run_id))
     }
     await this.client.from("agent_runs").delete().eq("dataset_id", datasetId).eq("org_id", this.orgId)
     await this.client.from("datasets").delete().eq("dataset_id", datasetId).eq("org_id", this.orgId)
@@ -234,12 +341,16 @@ export class SupabaseRepository {
       .throwOnError()
   }
 
-  async getVoiceSessions(): Promise<Record<string, unknown>[]> {
-    const { data } = await this.client
+  async getVoiceSessions(status?: string): Promise<Record<string, unknown>[]> {
+    let query = this.client
       .from("voice_sessions")
-      .select("*")
+      .select(VOICE_SESSION_COLUMNS)
       .eq("org_id", this.orgId)
       .order("created_at", { ascending: false })
+
+    if (status) query = query.eq("status", status)
+
+    const { data } = await query
     return data ?? []
   }
 
@@ -33,7 +33,11 @@ export function getSupabaseAdminClient(): SupabaseClient {
     throw new Error("SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY are required")
   }
 
-  _adminClient = createClient(url, serviceRoleKey)
+  // Shared across requests; the service role key never signs in, so skip
+  // session storage and the background token refresh timer.
+  _adminClient = createClient(url, serviceRoleKey, {
+    auth: { persistSession: false, autoRefreshToken: false },
+  })
   return _adminClient
 }
 